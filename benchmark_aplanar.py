@@ -0,0 +1,479 @@
+"""
+Benchmark of aplanar_directorio.py on a synthetic source tree.
+
+Generates a deterministic tree (same parameters and seed, same files), runs
+each stage on a fresh child process and reports files/s, MB/s, read/write
+syscalls, peak RSS and time per stage. Results are written to JSON so runs
+of different commits can be compared with --comparar, which fails (exit
+code 1) when a stage is slower or uses more memory than the tolerance.
+"""
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import aplanar_directorio
+
+# --- CONFIGURATION ---
+# Default parameters of the synthetic tree
+PARAMETROS_ARBOL_DEFAULT = {
+    'archivos': 2000,  # Number of files (outside .git)
+    'profundidad': 4,  # Maximum directory depth
+    'directorios_por_nivel': 4,  # Subdirectories of each directory
+    'tamaño_medio_kb': 8,  # Mean file size in KB
+    'distribucion': 'lognormal',  # Size distribution (see DISTRIBUCIONES_TAMAÑO)
+    'nombres_repetidos': 0.3,  # Ratio of files with a common name (README.md, values.yaml...)
+    'imagenes': 0.05,  # Ratio of image files
+    'binarios': 0.05,  # Ratio of binary files (PDFs and files without a text extension)
+    'vacios': 0.02,  # Ratio of empty files
+    'git_mb': 0,  # MB of objects in .git (never walked, but on disk)
+    'semilla': 0,
+}
+
+DISTRIBUCIONES_TAMAÑO = ('lognormal', 'uniforme', 'fija')
+
+# Names that repeat across a real tree, the ones that cause name conflicts
+NOMBRES_COMUNES = ('README.md', 'values.yaml', 'Makefile', 'index.js', '__init__.py', 'config.json',
+                   'Chart.yaml', 'LICENSE', 'main.go', 'build.sh')
+EXTENSIONES_TEXTO = ('txt', 'md', 'py', 'js', 'yaml', 'json', 'go', 'sh', 'html', 'css')
+EXTENSIONES_IMAGEN = ('png', 'jpg', 'svg', 'gif')
+EXTENSIONES_BINARIAS = ('pdf', 'bin', 'so', 'dat')
+
+# Words of the text files (fixed, so the word counts are the same on every run)
+VOCABULARIO = ('the', 'flatten', 'directory', 'value', 'config', 'return', 'import', 'def', 'class',
+               'name', 'image', 'kubernetes', 'deployment', 'service', 'replicas', 'port', 'if',
+               'else', 'for', 'while', 'string', 'int', 'true', 'false', 'null', 'metadata', 'spec')
+
+# Repetitions of each measured stage (the median time is reported)
+REPETICIONES_DEFAULT = 3
+# Allowed regression of time and peak RSS when comparing results (0.10 = 10 %)
+TOLERANCIA_DEFAULT = 0.10
+VERSION_RESULTADOS = 1
+# ---------------------
+
+
+def _tamaño_aleatorio(rng, distribucion, tamaño_medio):
+    """
+    Returns a file size in bytes drawn from 'distribucion' with mean 'tamaño_medio'.
+    """
+    if distribucion == 'fija':
+        return tamaño_medio
+    if distribucion == 'uniforme':
+        return rng.randint(1, 2 * tamaño_medio)
+    # Lognormal with sigma 1: mostly small files and a long tail of large ones
+    sigma = 1.0
+    mu = max(0.0, math.log(tamaño_medio) - sigma * sigma / 2)
+    return max(1, int(rng.lognormvariate(mu, sigma)))
+
+
+def _contenido_texto(rng, tamaño):
+    """
+    Returns 'tamaño' bytes of text made of lines of words of VOCABULARIO.
+    """
+    partes = []
+    total = 0
+    while total < tamaño:
+        linea = ' '.join(rng.choice(VOCABULARIO) for _ in range(rng.randint(3, 12))) + '\n'
+        partes.append(linea)
+        total += len(linea)
+    return ''.join(partes).encode('ascii')[:tamaño]
+
+
+def generar_arbol(destino, parametros):
+    """
+    Writes the synthetic source tree described by 'parametros' (see
+    PARAMETROS_ARBOL_DEFAULT) to 'destino'. The tree only depends on the
+    parameters: the same seed gives the same paths and contents.
+    Returns the number of files and bytes written outside .git.
+    """
+    rng = random.Random(parametros['semilla'])
+    tamaño_medio = int(parametros['tamaño_medio_kb'] * 1024)
+
+    # Directory tree: every directory has 'directorios_por_nivel' children
+    # up to the maximum depth
+    directorios = ['']
+    nivel = ['']
+    for profundidad in range(parametros['profundidad']):
+        nivel = [os.path.join(padre, f"dir{profundidad}_{numero}")
+                 for padre in nivel for numero in range(parametros['directorios_por_nivel'])]
+        directorios.extend(nivel)
+    for directorio in directorios:
+        os.makedirs(os.path.join(destino, directorio), exist_ok=True)
+
+    archivos = 0
+    bytes_escritos = 0
+    for numero in range(parametros['archivos']):
+        directorio = rng.choice(directorios)
+        tipo = rng.random()
+        if tipo < parametros['imagenes']:
+            nombre = f"imagen{numero}.{rng.choice(EXTENSIONES_IMAGEN)}"
+            binario = True
+        elif tipo < parametros['imagenes'] + parametros['binarios']:
+            nombre = f"binario{numero}.{rng.choice(EXTENSIONES_BINARIAS)}"
+            binario = True
+        elif rng.random() < parametros['nombres_repetidos']:
+            nombre = rng.choice(NOMBRES_COMUNES)
+            binario = False
+        else:
+            nombre = f"archivo{numero}.{rng.choice(EXTENSIONES_TEXTO)}"
+            binario = False
+
+        if rng.random() < parametros['vacios']:
+            contenido = b''
+        else:
+            tamaño = _tamaño_aleatorio(rng, parametros['distribucion'], tamaño_medio)
+            contenido = rng.randbytes(tamaño) if binario else _contenido_texto(rng, tamaño)
+
+        ruta = os.path.join(destino, directorio, nombre)
+        # A repeated name in the same directory just rewrites the file
+        if not os.path.exists(ruta):
+            archivos += 1
+        else:
+            bytes_escritos -= os.path.getsize(ruta)
+        with open(ruta, 'wb') as archivo:
+            archivo.write(contenido)
+        bytes_escritos += len(contenido)
+
+    # Object store: loose objects of random bytes, like an unpacked .git
+    restante = int(parametros['git_mb'] * 1024 * 1024)
+    numero = 0
+    while restante > 0:
+        tamaño = min(restante, max(1, int(rng.lognormvariate(8, 1.5))))
+        directorio_objetos = os.path.join(destino, '.git', 'objects', f"{numero % 256:02x}")
+        os.makedirs(directorio_objetos, exist_ok=True)
+        with open(os.path.join(directorio_objetos, f"{numero:038x}"), 'wb') as archivo:
+            archivo.write(rng.randbytes(tamaño))
+        restante -= tamaño
+        numero += 1
+
+    return {'archivos': archivos, 'bytes': bytes_escritos}
+
+
+def _leer_io_proceso():
+    """
+    Returns the I/O counters of this process (/proc/self/io: rchar, wchar,
+    syscr, syscw, read_bytes, write_bytes), or None where there are none.
+    """
+    try:
+        with open('/proc/self/io', 'r') as archivo:
+            return {clave: int(valor) for clave, valor in (linea.split(': ') for linea in archivo)}
+    except (OSError, ValueError):
+        return None
+
+
+def _medir_etapa(etapa, argumentos):
+    """
+    Runs one stage on this (child) process and returns its wall time, the
+    I/O counters it used and the peak RSS of the process and its children
+    (and, for the flattening, the time of each stage of its run metrics).
+    """
+    import resource
+
+    antes = _leer_io_proceso()
+    with open(os.devnull, 'w') as nulo:
+        salida, sys.stdout = sys.stdout, nulo
+        try:
+            inicio = time.perf_counter()
+            if etapa == 'recorrer':
+                resultado = sum(1 for _ in aplanar_directorio.recorrer_origen(argumentos['origen']))
+            elif etapa == 'aplanar':
+                resultado = aplanar_directorio.aplanar_directorio(argumentos['origen'], argumentos['destino'],
+                                                                   metricas=True, **argumentos['opciones'])
+            else:
+                resultado = aplanar_directorio.eliminar_archivos_vacios(argumentos['origen'])
+            segundos = time.perf_counter() - inicio
+        finally:
+            sys.stdout = salida
+    despues = _leer_io_proceso()
+
+    medida = {
+        'segundos': segundos,
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'max_rss_hijos_kb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        'io': {clave: despues[clave] - antes[clave] for clave in despues} if antes and despues else None,
+    }
+    if etapa == 'aplanar':
+        medida['resumen'] = {clave: valor for clave, valor in resultado.items()
+                             if clave not in ('fragmentos', 'metricas')}
+        # Time of each stage of the pipeline, from the run metrics
+        medida['etapas_aplanado'] = {nombre: etapa['segundos']
+                                     for nombre, etapa in resultado['metricas']['etapas'].items()}
+    return medida
+
+
+def medir(etapa, argumentos):
+    """
+    Runs a stage (see _medir_etapa) on a fresh spawned process, so the peak RSS is the
+    one of the stage alone.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(_medir_etapa, etapa, argumentos).result()
+
+
+def _resumir_medidas(medidas, arbol):
+    """
+    Summarizes the repetitions of a stage: median time (and the throughput
+    it gives), median syscalls and bytes, and the highest peak RSS.
+    """
+    segundos = statistics.median(medida['segundos'] for medida in medidas)
+    resumen = {
+        'segundos': segundos,
+        'segundos_repeticiones': [medida['segundos'] for medida in medidas],
+        'archivos_por_segundo': arbol['archivos'] / segundos if segundos else None,
+        'mb_por_segundo': arbol['bytes'] / (1024 * 1024) / segundos if segundos else None,
+        'max_rss_kb': max(medida['max_rss_kb'] for medida in medidas),
+        'max_rss_hijos_kb': max(medida['max_rss_hijos_kb'] for medida in medidas),
+        'io': None,
+    }
+    if all(medida['io'] is not None for medida in medidas):
+        resumen['io'] = {clave: int(statistics.median(medida['io'][clave] for medida in medidas))
+                         for clave in medidas[0]['io']}
+    if 'resumen' in medidas[0]:
+        resumen['resumen'] = medidas[0]['resumen']
+        resumen['etapas_aplanado'] = {nombre: statistics.median(medida['etapas_aplanado'].get(nombre, 0.0)
+                                                                for medida in medidas)
+                                      for nombre in medidas[0]['etapas_aplanado']}
+    return resumen
+
+
+def _commit_actual():
+    """
+    Returns the commit of the checkout of this script, or None.
+    """
+    try:
+        resultado = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   capture_output=True, text=True, check=True)
+        return resultado.stdout.strip()
+    except Exception:
+        return None
+
+
+def ejecutar_benchmark(parametros, opciones_aplanado, repeticiones=REPETICIONES_DEFAULT, directorio_trabajo=None):
+    """
+    Generates the tree and measures, 'repeticiones' times each: the walk of
+    the source (recorrer), the flattening (aplanar, to a new destination
+    every time) and eliminar_archivos_vacios (on a copy of the source, which
+    has empty files). Returns the results as saved in the JSON file.
+    """
+    trabajo = tempfile.mkdtemp(prefix="benchmark_aplanar_", dir=directorio_trabajo)
+    try:
+        origen = os.path.join(trabajo, 'origen')
+        print(f"Generating synthetic tree in: {origen}")
+        inicio = time.perf_counter()
+        arbol = generar_arbol(origen, parametros)
+        arbol['segundos_generacion'] = time.perf_counter() - inicio
+        print(f"  -> {arbol['archivos']:,} files, {arbol['bytes'] / (1024 * 1024):.1f} MB "
+              f"({arbol['segundos_generacion']:.2f} s)")
+
+        etapas = {}
+        for etapa in ('recorrer', 'aplanar', 'eliminar_vacios'):
+            medidas = []
+            for repeticion in range(repeticiones):
+                argumentos = {'origen': origen, 'opciones': opciones_aplanado}
+                if etapa == 'aplanar':
+                    argumentos['destino'] = os.path.join(trabajo, f"destino_{repeticion}")
+                elif etapa == 'eliminar_vacios':
+                    argumentos['origen'] = os.path.join(trabajo, f"copia_{repeticion}")
+                    shutil.copytree(origen, argumentos['origen'], symlinks=True)
+                medidas.append(medir(etapa, argumentos))
+                if etapa != 'recorrer':
+                    shutil.rmtree(argumentos.get('destino', argumentos['origen']), ignore_errors=True)
+            etapas[etapa] = _resumir_medidas(medidas, arbol)
+            print(f"  -> {etapa}: {etapas[etapa]['segundos']:.3f} s, "
+                  f"{etapas[etapa]['archivos_por_segundo']:,.0f} files/s, "
+                  f"{etapas[etapa]['mb_por_segundo']:,.1f} MB/s, "
+                  f"peak RSS {etapas[etapa]['max_rss_kb'] / 1024:.1f} MB")
+            if 'etapas_aplanado' in etapas[etapa]:
+                print("     " + ", ".join(f"{nombre} {segundos:.3f} s"
+                                           for nombre, segundos in etapas[etapa]['etapas_aplanado'].items()))
+    finally:
+        shutil.rmtree(trabajo, ignore_errors=True)
+
+    return {
+        'version': VERSION_RESULTADOS,
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': _commit_actual(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'parametros': parametros,
+        'opciones': opciones_aplanado,
+        'repeticiones': repeticiones,
+        'arbol': arbol,
+        'etapas': etapas,
+    }
+
+
+def comparar_resultados(base, actual, tolerancia=TOLERANCIA_DEFAULT):
+    """
+    Compares two benchmark results stage by stage. A stage regresses when its
+    time or its peak RSS grows by more than 'tolerancia' (a ratio).
+    Returns the list of regressions (empty if there are none).
+    """
+    if base['parametros'] != actual['parametros'] or base['opciones'] != actual['opciones']:
+        print("Warning: the results were taken with different parameters, the comparison may not be meaningful")
+
+    regresiones = []
+    print(f"\nComparing {base.get('commit') or 'base'} -> {actual.get('commit') or 'current'} "
+          f"(tolerance {tolerancia:.0%})")
+    for etapa, medida in actual['etapas'].items():
+        medida_base = base['etapas'].get(etapa)
+        if medida_base is None:
+            continue
+        for clave in ('segundos', 'max_rss_kb'):
+            if not medida_base[clave]:
+                continue
+            cambio = medida[clave] / medida_base[clave] - 1
+            marca = ""
+            if cambio > tolerancia:
+                marca = "  <-- REGRESSION"
+                regresiones.append(f"{etapa}.{clave}: {medida_base[clave]:,.3f} -> {medida[clave]:,.3f} ({cambio:+.1%})")
+            print(f"  {etapa:16} {clave:11} {medida_base[clave]:>14,.3f} -> {medida[clave]:>14,.3f} ({cambio:+.1%}){marca}")
+    return regresiones
+
+
+def mostrar_ayuda():
+    """
+    Shows the script help information.
+    """
+    print("""
+Flatten Directory Benchmark
+
+USAGE:
+    python benchmark_aplanar.py [OPTIONS]
+
+TREE OPTIONS:
+    --archivos N            Files of the synthetic tree (default: {archivos})
+    --profundidad N         Maximum directory depth (default: {profundidad})
+    --directorios-por-nivel N
+                            Subdirectories of each directory (default: {directorios_por_nivel})
+    --tamaño-medio-kb X     Mean file size in KB (default: {tamaño_medio_kb})
+    --distribucion NAME     Size distribution: lognormal, uniforme or fija (default: {distribucion})
+    --nombres-repetidos X   Ratio of files with a common name (default: {nombres_repetidos})
+    --imagenes X            Ratio of images (default: {imagenes})
+    --binarios X            Ratio of binary files (default: {binarios})
+    --vacios X              Ratio of empty files (default: {vacios})
+    --git-mb X              MB of objects in .git (default: {git_mb})
+    --semilla N             Seed of the generator (default: {semilla})
+
+RUN OPTIONS:
+    --workers N             --workers of the flattening (default: 1)
+    --procesos N            --procesos of the flattening (default: 0)
+    --repeticiones N        Runs of each stage, the median is reported (default: {repeticiones})
+    --directorio DIR        Where the tree and the outputs are written (default: the temp folder)
+    --salida FILE           Write the results to FILE (JSON)
+
+COMPARISON:
+    --comparar BASE         Compare the results with BASE (a JSON file of a previous run);
+                            exit code 1 if a stage regresses
+    --actual FILE           Compare FILE with BASE instead of running the benchmark
+    --tolerancia X          Allowed growth of time and peak RSS (default: {tolerancia})
+
+EXAMPLES:
+    # Baseline on the main branch, then check a change against it
+    python benchmark_aplanar.py --archivos 20000 --salida base.json
+    python benchmark_aplanar.py --archivos 20000 --salida nuevo.json --comparar base.json
+""".format(repeticiones=REPETICIONES_DEFAULT, tolerancia=TOLERANCIA_DEFAULT, **PARAMETROS_ARBOL_DEFAULT))
+
+
+def parsear_argumentos():
+    """
+    Parses command line arguments and returns the tree parameters and options.
+    """
+    parametros = dict(PARAMETROS_ARBOL_DEFAULT)
+    opciones = {
+        'workers': 1,
+        'procesos': 0,
+        'repeticiones': REPETICIONES_DEFAULT,
+        'directorio': None,
+        'salida': None,
+        'comparar': None,
+        'actual': None,
+        'tolerancia': TOLERANCIA_DEFAULT,
+    }
+    # Option -> (key, type) of the options that take a value
+    con_valor = {
+        '--archivos': (parametros, 'archivos', int),
+        '--profundidad': (parametros, 'profundidad', int),
+        '--directorios-por-nivel': (parametros, 'directorios_por_nivel', int),
+        '--tamaño-medio-kb': (parametros, 'tamaño_medio_kb', float),
+        '--distribucion': (parametros, 'distribucion', str),
+        '--nombres-repetidos': (parametros, 'nombres_repetidos', float),
+        '--imagenes': (parametros, 'imagenes', float),
+        '--binarios': (parametros, 'binarios', float),
+        '--vacios': (parametros, 'vacios', float),
+        '--git-mb': (parametros, 'git_mb', float),
+        '--semilla': (parametros, 'semilla', int),
+        '--workers': (opciones, 'workers', int),
+        '--procesos': (opciones, 'procesos', int),
+        '--repeticiones': (opciones, 'repeticiones', int),
+        '--directorio': (opciones, 'directorio', str),
+        '--salida': (opciones, 'salida', str),
+        '--comparar': (opciones, 'comparar', str),
+        '--actual': (opciones, 'actual', str),
+        '--tolerancia': (opciones, 'tolerancia', float),
+    }
+
+    i = 1
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        if arg in ('-h', '--help'):
+            mostrar_ayuda()
+            sys.exit(0)
+        elif arg in con_valor:
+            destino, clave, tipo = con_valor[arg]
+            try:
+                destino[clave] = tipo(sys.argv[i + 1])
+                i += 1
+            except (IndexError, ValueError):
+                print(f"Error: {arg} requires a value of type {tipo.__name__}")
+                print("Use --help to see help.")
+                sys.exit(1)
+        else:
+            print(f"Error: Unknown option: {arg}")
+            print("Use --help to see help.")
+            sys.exit(1)
+        i += 1
+
+    if parametros['distribucion'] not in DISTRIBUCIONES_TAMAÑO:
+        print(f"Error: --distribucion must be one of: {', '.join(DISTRIBUCIONES_TAMAÑO)}")
+        sys.exit(1)
+    if opciones['actual'] and not opciones['comparar']:
+        print("Error: --actual requires --comparar")
+        sys.exit(1)
+    return parametros, opciones
+
+
+if __name__ == "__main__":
+    parametros, opciones = parsear_argumentos()
+
+    if opciones['actual']:
+        with open(opciones['actual'], 'r', encoding='utf-8') as archivo:
+            resultados = json.load(archivo)
+    else:
+        resultados = ejecutar_benchmark(parametros, {'workers': opciones['workers'], 'procesos': opciones['procesos']},
+                                        opciones['repeticiones'], opciones['directorio'])
+        if opciones['salida']:
+            with open(opciones['salida'], 'w', encoding='utf-8') as archivo:
+                json.dump(resultados, archivo, ensure_ascii=False, indent=2)
+            print(f"Results written to: {opciones['salida']}")
+
+    if opciones['comparar']:
+        with open(opciones['comparar'], 'r', encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        regresiones = comparar_resultados(base, resultados, opciones['tolerancia'])
+        if regresiones:
+            print(f"\n{len(regresiones)} regressions:")
+            for regresion in regresiones:
+                print(f"  !! {regresion}")
+            sys.exit(1)
+        print("\nNo regressions")
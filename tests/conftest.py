@@ -0,0 +1,119 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# The script is a single module at the root of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aplanar_directorio  # noqa: E402
+
+
+def _crear_arbol(raiz, archivos):
+    """
+    Writes 'archivos' ({relative path: str or bytes}) below 'raiz'.
+    """
+    for ruta_relativa, contenido in archivos.items():
+        ruta = os.path.join(raiz, *ruta_relativa.split('/'))
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        if isinstance(contenido, str):
+            contenido = contenido.encode('utf-8')
+        with open(ruta, 'wb') as archivo:
+            archivo.write(contenido)
+    return str(raiz)
+
+
+def _leer_arbol(raiz):
+    """
+    Returns {relative path: content} of the flattened files below 'raiz'
+    (the temporary folder of the run is left out).
+    """
+    contenidos = {}
+    for directorio, subdirectorios, nombres in os.walk(raiz):
+        subdirectorios[:] = [nombre for nombre in subdirectorios
+                             if nombre != aplanar_directorio.DIRECTORIO_TEMPORAL]
+        for nombre in nombres:
+            ruta = os.path.join(directorio, nombre)
+            with open(ruta, 'rb') as archivo:
+                contenidos[os.path.relpath(ruta, raiz).replace(os.sep, '/')] = archivo.read()
+    return contenidos
+
+
+def _git(*argumentos):
+    """
+    Runs git with a fixed identity and default branch, returns its output.
+    """
+    return subprocess.run(['git', '-c', 'user.name=prueba', '-c', 'user.email=prueba@example.com',
+                           '-c', 'init.defaultBranch=main'] + list(argumentos),
+                          check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _commit(trabajo, archivos):
+    """
+    Writes 'archivos' in the working tree 'trabajo', commits every change
+    in it (deleted and renamed files too) and returns the commit.
+    """
+    _crear_arbol(trabajo, archivos)
+    _git('-C', trabajo, 'add', '-A')
+    _git('-C', trabajo, 'commit', '--quiet', '--allow-empty', '-m', 'cambio')
+    return _git('-C', trabajo, 'rev-parse', 'HEAD')
+
+
+@pytest.fixture
+def crear_arbol():
+    return _crear_arbol
+
+
+@pytest.fixture
+def leer_arbol():
+    return _leer_arbol
+
+
+@pytest.fixture
+def arbol_variado(tmp_path):
+    """
+    Source tree with repeated names, conversions, images, binaries, empty
+    files, a shebang to clean and one large text file.
+    """
+    archivos = {}
+    for indice in range(120):
+        archivos[f"modulo{indice % 7}/sub{indice % 3}/util{indice % 11}.py"] = f"def f{indice}():\n    return {indice}\n"
+    for indice in range(15):
+        archivos[f"config/app{indice % 4}.yaml"] = f"clave: {indice}\nlista: [a, b, c]\n"
+        archivos[f"img/foto{indice % 5}_{indice}.png"] = b'\x89PNG\r\n\x1a\n' + bytes([indice]) * 100
+    archivos["scripts/run.sh"] = "#!/bin/bash\necho hola mundo\n"
+    archivos["vacio.txt"] = ""
+    archivos["datos/blob.bin"] = b'\x00\x01\x02' * 1000
+    archivos["fuentes/letra.ttf"] = b'fuente'
+    archivos["logs/grande.log"] = "palabra otra\n" * 150000
+    return _crear_arbol(tmp_path / "origen", archivos)
+
+
+@pytest.fixture
+def git():
+    return _git
+
+
+@pytest.fixture
+def commit_git():
+    return _commit
+
+
+@pytest.fixture
+def repositorio(tmp_path):
+    """
+    Returns a function that creates a bare repository with one commit of
+    'archivos' (by default a leeme.txt) and returns (file:// URL, working
+    clone, commit). The bare repository accepts partial clones.
+    """
+    def crear(nombre, archivos=None):
+        trabajo = str(tmp_path / f"{nombre}-trabajo")
+        _git('init', '--quiet', trabajo)
+        commit = _commit(trabajo, archivos if archivos is not None else {"leeme.txt": f"{nombre}\n"})
+        desnudo = str(tmp_path / f"{nombre}.git")
+        _git('clone', '--quiet', '--bare', trabajo, desnudo)
+        _git('-C', desnudo, 'config', 'uploadpack.allowFilter', 'true')
+        _git('-C', trabajo, 'remote', 'add', 'origin', desnudo)
+        return f"file://{desnudo}", trabajo, commit
+    return crear
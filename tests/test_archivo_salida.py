@@ -0,0 +1,67 @@
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+import aplanar_directorio
+
+
+def _leer_fragmentos(fragmentos):
+    """
+    Returns {entry name: content} of every tar or zip shard, and the
+    content sizes of each shard.
+    """
+    contenidos, tamaños = {}, []
+    for ruta in fragmentos:
+        if ruta.endswith('.zip'):
+            with zipfile.ZipFile(ruta) as archivo:
+                entradas = {nombre: archivo.read(nombre) for nombre in archivo.namelist()}
+        else:
+            with tarfile.open(ruta) as archivo:
+                entradas = {miembro.name: archivo.extractfile(miembro).read() for miembro in archivo}
+        assert not entradas.keys() & contenidos.keys()
+        contenidos.update(entradas)
+        tamaños.append([len(contenido) for contenido in entradas.values()])
+    return contenidos, tamaños
+
+
+@pytest.mark.parametrize('formato', ['tar', 'zip'])
+@pytest.mark.parametrize('comprimir', [False, True])
+def test_shards_hold_the_files_of_a_normal_run(tmp_path, monkeypatch, arbol_variado, leer_arbol, formato, comprimir):
+    monkeypatch.setattr(aplanar_directorio, 'MAX_FILES_PER_FOLDER', 40)
+    normal = str(tmp_path / "normal")
+    aplanar_directorio.aplanar_directorio(arbol_variado, normal)
+    destino = str(tmp_path / "destino")
+    resumen = aplanar_directorio.aplanar_directorio(arbol_variado, destino, archivo_salida=formato,
+                                                    comprimir=comprimir)
+
+    extension = '.zip' if formato == 'zip' else ('.tar.gz' if comprimir else '.tar')
+    assert len(resumen['fragmentos']) > 2
+    assert all(ruta.endswith(extension) for ruta in resumen['fragmentos'])
+    assert sorted(os.listdir(destino)) == sorted(os.path.basename(ruta) for ruta in resumen['fragmentos'])
+    contenidos, _ = _leer_fragmentos(resumen['fragmentos'])
+    assert contenidos == leer_arbol(normal)
+
+
+@pytest.mark.parametrize('formato', ['tar', 'zip'])
+def test_shards_are_split_at_the_size_limit(tmp_path, arbol_variado, leer_arbol, formato):
+    normal = str(tmp_path / "normal")
+    aplanar_directorio.aplanar_directorio(arbol_variado, normal)
+    destino = str(tmp_path / "destino")
+    resumen = aplanar_directorio.aplanar_directorio(arbol_variado, destino, archivo_salida=formato,
+                                                    shard_max_mb=1 / 64)
+
+    assert all('.part' in os.path.basename(ruta) for ruta in resumen['fragmentos'])
+    contenidos, tamaños = _leer_fragmentos(resumen['fragmentos'])
+    assert contenidos == leer_arbol(normal)
+    # A file larger than the limit goes alone in its part
+    for tamaños_fragmento in tamaños:
+        assert sum(tamaños_fragmento) <= 1024 * 1024 / 64 or len(tamaños_fragmento) == 1
+    assert len(tamaños) > 2
+
+
+def test_shards_cant_be_combined_with_the_incremental_mode(tmp_path, arbol_variado):
+    with pytest.raises(ValueError):
+        aplanar_directorio.aplanar_directorio(arbol_variado, str(tmp_path / "destino"),
+                                              archivo_salida='tar', incremental=True)
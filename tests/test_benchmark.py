@@ -0,0 +1,39 @@
+import benchmark_aplanar
+
+PARAMETROS = dict(benchmark_aplanar.PARAMETROS_ARBOL_DEFAULT, archivos=60, profundidad=2, tamaño_medio_kb=1,
+                  vacios=0.2, git_mb=0.01)
+
+
+def test_same_seed_same_tree(tmp_path, leer_arbol):
+    uno = benchmark_aplanar.generar_arbol(str(tmp_path / "uno"), PARAMETROS)
+    dos = benchmark_aplanar.generar_arbol(str(tmp_path / "dos"), PARAMETROS)
+    benchmark_aplanar.generar_arbol(str(tmp_path / "tres"), dict(PARAMETROS, semilla=1))
+
+    contenidos = leer_arbol(tmp_path / "uno")
+    assert uno == dos
+    assert contenidos == leer_arbol(tmp_path / "dos") != leer_arbol(tmp_path / "tres")
+    # The counts leave out the object store
+    fuera_de_git = {ruta: contenido for ruta, contenido in contenidos.items() if not ruta.startswith('.git/')}
+    assert len(fuera_de_git) < len(contenidos)
+    assert uno == {'archivos': len(fuera_de_git), 'bytes': sum(map(len, fuera_de_git.values()))}
+
+
+def _resultado(segundos, max_rss_kb):
+    return {'parametros': PARAMETROS, 'opciones': {},
+            'etapas': {'aplanar': {'segundos': segundos, 'max_rss_kb': max_rss_kb}}}
+
+
+def test_comparison_flags_regressions_over_the_tolerance():
+    base = _resultado(1.0, 1000)
+    assert benchmark_aplanar.comparar_resultados(base, _resultado(1.05, 1050), tolerancia=0.10) == []
+    regresiones = benchmark_aplanar.comparar_resultados(base, _resultado(1.5, 1050), tolerancia=0.10)
+    assert len(regresiones) == 1 and regresiones[0].startswith("aplanar.segundos")
+
+
+def test_benchmark_measures_every_stage(tmp_path):
+    resultado = benchmark_aplanar.ejecutar_benchmark(PARAMETROS, {}, repeticiones=1, directorio_trabajo=str(tmp_path))
+
+    assert set(resultado['etapas']) == {'recorrer', 'aplanar', 'eliminar_vacios'}
+    assert all(etapa['segundos'] > 0 for etapa in resultado['etapas'].values())
+    # The working directory is removed at the end
+    assert list(tmp_path.iterdir()) == []
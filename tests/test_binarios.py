@@ -0,0 +1,41 @@
+import pytest
+
+import aplanar_directorio
+
+
+@pytest.mark.parametrize('muestra', [
+    b'%PDF-1.7\n',
+    b'\x7fELF\x02\x01\x01',
+    b'\x00\x00\x00\x18ftypmp42',
+    b'SQLite format 3\x00',
+    b'texto\x00con un NUL',
+    bytes(range(1, 32)) * 10,
+])
+def test_binary_samples(muestra):
+    assert aplanar_directorio.es_contenido_binario(muestra)
+
+
+@pytest.mark.parametrize('muestra', [
+    b'',
+    b'def f():\n\treturn 1\r\n',
+    'canción, pingüino y €\n'.encode('utf-8'),
+    b'\x1b[1mnegrita\x1b[0m en un log\n',
+])
+def test_text_samples(muestra):
+    assert not aplanar_directorio.es_contenido_binario(muestra)
+
+
+def test_binaries_are_copied_untouched_with_estimated_words(tmp_path, monkeypatch, crear_arbol, leer_arbol):
+    binario = b'palabras sueltas \x00\x01\x02' + bytes(range(256)) * 20
+    origen = crear_arbol(tmp_path / "origen", {"datos/volcado.bin": binario})
+    palabras_estimadas = aplanar_directorio.estimar_palabras_binario(len(binario))
+
+    monkeypatch.setattr(aplanar_directorio, 'MAX_WORDS_PER_FILE', palabras_estimadas)
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(origen, destino)
+    assert list(leer_arbol(destino).values()) == [binario]
+
+    monkeypatch.setattr(aplanar_directorio, 'MAX_WORDS_PER_FILE', palabras_estimadas - 1)
+    destino = str(tmp_path / "destino_limitado")
+    aplanar_directorio.aplanar_directorio(origen, destino)
+    assert leer_arbol(destino) == {}
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+import aplanar_directorio
+
+pytestmark = pytest.mark.skipif(not aplanar_directorio.verificar_git_disponible(), reason="git no disponible")
+
+
+def test_open_creates_the_mirror_and_fetches_into_it_again(tmp_path, repositorio, git, commit_git):
+    url, trabajo, commit = repositorio("uno")
+    cache = aplanar_directorio.CacheGit(str(tmp_path / "cache"))
+    espejo = cache.abrir(url)
+    cache.cerrar()
+    assert git('-C', espejo, 'rev-parse', 'HEAD') == commit
+
+    nuevo = commit_git(trabajo, {"otro.txt": "nuevo\n"})
+    git('-C', trabajo, 'push', '--quiet', 'origin', 'HEAD:main')
+    assert cache.abrir(url) == espejo
+    cache.cerrar()
+    assert git('-C', espejo, 'rev-parse', 'HEAD') == nuevo
+    assert git('-C', espejo, 'rev-parse', commit) == commit
+
+    worktree = str(tmp_path / "worktree")
+    assert cache.crear_worktree(espejo, worktree, commit)
+    assert sorted(os.listdir(worktree)) == ['.git', 'leeme.txt']
+    cache.eliminar_worktree(espejo, worktree)
+
+
+def test_least_recently_used_mirror_is_evicted(tmp_path, repositorio, git):
+    url_uno, _, _ = repositorio("uno")
+    url_dos, _, _ = repositorio("dos")
+    cache = aplanar_directorio.CacheGit(str(tmp_path / "cache"), max_mb=0)
+    espejo_uno = cache.abrir(url_uno)
+    cache.cerrar()
+    espejo_dos = cache.abrir(url_dos)
+    cache.cerrar()
+
+    assert not os.path.exists(espejo_uno)
+    assert os.path.isdir(espejo_dos)
+
+
+def test_mirror_in_use_is_not_evicted(tmp_path, repositorio, git):
+    url_uno, _, commit = repositorio("uno")
+    url_dos, _, _ = repositorio("dos")
+    en_uso = aplanar_directorio.CacheGit(str(tmp_path / "cache"), max_mb=0)
+    espejo_uno = en_uso.abrir(url_uno)
+
+    otra = aplanar_directorio.CacheGit(str(tmp_path / "cache"), max_mb=0)
+    otra.abrir(url_dos)
+    otra.cerrar()
+    assert git('-C', espejo_uno, 'rev-parse', 'HEAD') == commit
+
+    en_uso.cerrar()
+    otra.abrir(url_dos)
+    otra.cerrar()
+    assert not os.path.exists(espejo_uno)
+
+
+@pytest.mark.parametrize('bare', [False, True])
+def test_clone_of_a_commit(tmp_path, repositorio, git, commit_git, bare):
+    url, trabajo, commit = repositorio("uno")
+    commit_git(trabajo, {"leeme.txt": "después\n"})
+    git('-C', trabajo, 'push', '--quiet', 'origin', 'HEAD:main')
+
+    clon = str(tmp_path / "clon")
+    assert aplanar_directorio.clonar_repositorio_git(url, clon, bare=bare, rama=commit)
+    assert git('-C', clon, 'rev-parse', 'HEAD') == commit
+    if not bare:
+        with open(os.path.join(clon, "leeme.txt")) as archivo:
+            assert archivo.read() == "uno\n"
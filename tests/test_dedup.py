@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+import aplanar_directorio
+
+ARCHIVOS = {
+    "a/licencia.txt": "MIT License\n",
+    "b/copia.txt": "MIT License\n",
+    "c/otro.txt": "otro contenido\n",
+}
+
+
+def test_dedup_skip_writes_each_content_once(tmp_path, crear_arbol, leer_arbol):
+    origen = crear_arbol(tmp_path / "origen", ARCHIVOS)
+    destino = str(tmp_path / "destino")
+    resumen = aplanar_directorio.aplanar_directorio(origen, destino, dedup='skip')
+
+    assert resumen['duplicados'] == 1
+    salida = leer_arbol(destino)
+    assert sorted(salida.values()) == [b"MIT License\n", b"otro contenido\n"]
+    assert len({"licencia.txt", "copia.txt"} & set(salida)) == 1
+
+
+@pytest.mark.parametrize('modo', ['hardlink', 'reflink'])
+def test_dedup_links_keep_every_name(tmp_path, crear_arbol, leer_arbol, modo):
+    origen = crear_arbol(tmp_path / "origen", ARCHIVOS)
+    destino = str(tmp_path / "destino")
+    resumen = aplanar_directorio.aplanar_directorio(origen, destino, dedup=modo)
+
+    assert resumen['duplicados'] == 1
+    assert leer_arbol(destino) == {
+        "licencia.txt": b"MIT License\n",
+        "copia.txt": b"MIT License\n",
+        "otro.txt": b"otro contenido\n",
+    }
+    if modo == 'hardlink':
+        assert resumen['bytes_ahorrados'] == len(b"MIT License\n")
+        assert (os.stat(os.path.join(destino, "licencia.txt")).st_ino
+                == os.stat(os.path.join(destino, "copia.txt")).st_ino)
+
+
+def test_incremental_rewrite_does_not_change_hardlinked_duplicates(tmp_path, crear_arbol, leer_arbol):
+    origen = crear_arbol(tmp_path / "origen", {"x.txt": "igual\n", "y.txt": "igual\n"})
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(origen, destino, incremental=True, dedup='hardlink')
+
+    with open(os.path.join(origen, "x.txt"), 'w') as archivo:
+        archivo.write("cambiado\n")
+    aplanar_directorio.aplanar_directorio(origen, destino, incremental=True, dedup='hardlink')
+
+    assert leer_arbol(destino) == {"x.txt": b"cambiado\n", "y.txt": b"igual\n"}
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_failed_links_fall_back_to_a_copy_and_save_nothing(tmp_path, monkeypatch, crear_arbol, leer_arbol, workers):
+    monkeypatch.setattr(aplanar_directorio, 'enlazar_duplicado', lambda *argumentos: False)
+    origen = crear_arbol(tmp_path / "origen", ARCHIVOS)
+    destino = str(tmp_path / "destino")
+    resumen = aplanar_directorio.aplanar_directorio(origen, destino, workers=workers, dedup='hardlink')
+
+    assert (resumen['duplicados'], resumen['enlaces_fallidos'], resumen['bytes_ahorrados']) == (1, 1, 0)
+    assert leer_arbol(destino) == {
+        "licencia.txt": b"MIT License\n",
+        "copia.txt": b"MIT License\n",
+        "otro.txt": b"otro contenido\n",
+    }
+    assert (os.stat(os.path.join(destino, "licencia.txt")).st_ino
+            != os.stat(os.path.join(destino, "copia.txt")).st_ino)
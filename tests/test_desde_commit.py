@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+import aplanar_directorio
+
+pytestmark = pytest.mark.skipif(not aplanar_directorio.verificar_git_disponible(), reason="git no disponible")
+
+ARCHIVOS = {
+    "a/uno.txt": "uno = 1\n",
+    "b/dos.txt": "dos = 2\n",
+    "c/tres.txt": "tres = 3\n",
+}
+
+
+@pytest.mark.parametrize('git_ref', [None, 'HEAD'])
+def test_since_applies_renames_and_deletions(tmp_path, repositorio, commit_git, leer_arbol, git_ref):
+    _, trabajo, primero = repositorio("uno", ARCHIVOS)
+    destino = str(tmp_path / "destino")
+    # No manifest yet: the whole source is flattened
+    resumen = aplanar_directorio.aplanar_directorio(trabajo, destino, desde_commit=primero, git_ref=git_ref)
+    assert resumen['archivos_copiados'] == 3
+
+    os.makedirs(os.path.join(trabajo, "d"))
+    os.rename(os.path.join(trabajo, "b", "dos.txt"), os.path.join(trabajo, "d", "dos_nuevo.txt"))
+    os.remove(os.path.join(trabajo, "c", "tres.txt"))
+    commit_git(trabajo, {"a/cuatro.txt": "cuatro = 4\n"})
+
+    resumen = aplanar_directorio.aplanar_directorio(trabajo, destino, desde_commit=primero, git_ref=git_ref)
+    # uno.txt did not change and is not even looked at; the renamed file
+    # keeps its content, so only its destination file is renamed
+    assert (resumen['sin_cambios'], resumen['renombrados'], resumen['eliminados']) == (0, 1, 1)
+
+    nuevo = str(tmp_path / "nuevo")
+    aplanar_directorio.aplanar_directorio(trabajo, nuevo, git_ref=git_ref)
+    assert leer_arbol(destino) == leer_arbol(nuevo) == {
+        "uno.txt": b"uno = 1\n",
+        "dos_nuevo.txt": b"dos = 2\n",
+        "cuatro.txt": b"cuatro = 4\n",
+    }
+
+
+def test_since_a_missing_commit_walks_the_whole_source(tmp_path, caplog, repositorio, leer_arbol):
+    _, trabajo, primero = repositorio("uno", ARCHIVOS)
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(trabajo, destino, desde_commit=primero)
+    os.remove(os.path.join(trabajo, "c", "tres.txt"))
+
+    resumen = aplanar_directorio.aplanar_directorio(trabajo, destino, desde_commit='no-existe')
+    assert "Error al comparar con no-existe" in caplog.text
+    assert (resumen['sin_cambios'], resumen['eliminados']) == (2, 1)
+    assert leer_arbol(destino) == {"uno.txt": b"uno = 1\n", "dos.txt": b"dos = 2\n"}
@@ -0,0 +1,43 @@
+import re
+
+import aplanar_directorio
+
+
+def _partes(salida, nombre):
+    patron = re.compile(re.escape(nombre) + r'\.part(\d+)\.txt$')
+    numeradas = {int(patron.search(ruta).group(1)): contenido
+                 for ruta, contenido in salida.items() if patron.search(ruta)}
+    return [numeradas[numero] for numero in sorted(numeradas)]
+
+
+def test_parts_concatenate_back_to_the_source(tmp_path, monkeypatch, crear_arbol, leer_arbol):
+    monkeypatch.setattr(aplanar_directorio, 'MAX_WORDS_PER_FILE', 200)
+    monkeypatch.setattr(aplanar_directorio, 'MAX_FILE_SIZE_MB', 4096 / (1024 * 1024))
+    contenido = "".join(f"linea {numero} " + "palabra " * (numero % 7) + "\n" for numero in range(2000))
+    contenido += "x" * 10000 + "\n" + "   " + "y" * 5000 + " fin\n"
+    origen = crear_arbol(tmp_path / "origen", {"datos/grande.log": contenido})
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(origen, destino, dividir_grandes=True)
+
+    partes = _partes(leer_arbol(destino), "grande")
+    assert len(partes) > 1
+    assert b"".join(partes) == contenido.encode()
+    for parte in partes:
+        assert len(parte) <= 4096
+        assert aplanar_directorio.contar_palabras_bloque(parte)[0] <= 200
+        assert parte.strip()
+
+
+def test_leading_blanks_before_a_long_word_are_not_a_part_of_their_own(tmp_path):
+    divisor = aplanar_directorio.DivisorPartes(str(tmp_path), 0, 10)
+    datos = b"   " + b"x" * 30 + b"\n"
+    divisor.escribir(datos)
+    partes = divisor.cerrar()
+
+    contenidos = []
+    for parte in partes:
+        with open(parte['ruta_temporal'], 'rb') as archivo:
+            contenidos.append(archivo.read())
+    assert b"".join(contenidos) == datos
+    assert all(contenido.strip() for contenido in contenidos)
+    assert all(len(contenido) <= 10 for contenido in contenidos)
@@ -0,0 +1,71 @@
+import pytest
+
+import aplanar_directorio
+
+MAX_BYTES = 1024
+MAX_PALABRAS = 120
+
+
+def _arbol_empaquetado():
+    # Files heavy in words (short words) and heavy in bytes (long words)
+    archivos = {}
+    for indice in range(60):
+        palabra = "p" if indice % 2 else "x" * 30
+        archivos[f"d{indice % 5}/archivo{indice}.txt"] = " ".join([palabra] * (indice * 7 % 50 + 1)) + "\n"
+    return archivos
+
+
+def _ocupacion(salida):
+    """
+    Returns {folder: (files, bytes, words)} of the file folders of a
+    flattened output (the destination root and carpeta_2, carpeta_3...).
+    """
+    ocupacion = {}
+    for ruta, contenido in salida.items():
+        carpeta = ruta.rsplit('/', 1)[0] if '/' in ruta else '.'
+        archivos, bytes_carpeta, palabras = ocupacion.get(carpeta, (0, 0, 0))
+        ocupacion[carpeta] = (archivos + 1, bytes_carpeta + len(contenido), palabras + len(contenido.split()))
+    return ocupacion
+
+
+def test_packing_stays_within_the_folder_limits(tmp_path, crear_arbol, leer_arbol):
+    origen = crear_arbol(tmp_path / "origen", _arbol_empaquetado())
+    limites = {'max_mb_carpeta': MAX_BYTES / (1024 * 1024), 'max_palabras_carpeta': MAX_PALABRAS}
+    en_orden = str(tmp_path / "en_orden")
+    aplanar_directorio.aplanar_directorio(origen, en_orden, **limites)
+    empaquetado = str(tmp_path / "empaquetado")
+    resumen = aplanar_directorio.aplanar_directorio(origen, empaquetado, empaquetar=True, **limites)
+
+    ocupacion = _ocupacion(leer_arbol(empaquetado))
+    assert len(ocupacion) == resumen['carpetas_archivos'] > 1
+    for archivos, bytes_carpeta, palabras in ocupacion.values():
+        assert archivos == 1 or (bytes_carpeta <= MAX_BYTES and palabras <= MAX_PALABRAS)
+    # Same files, in fewer folders than filling them in walk order
+    assert len(ocupacion) < len(_ocupacion(leer_arbol(en_orden)))
+    assert (sorted(ruta.rsplit('/', 1)[-1] for ruta in leer_arbol(empaquetado))
+            == sorted(ruta.rsplit('/', 1)[-1] for ruta in leer_arbol(en_orden)))
+
+
+def test_first_fit_decreasing():
+    elementos = [(10, 0), (60, 0), (40, 0), (30, 0), (50, 0), (200, 0)]
+    asignacion = aplanar_directorio.empaquetar_carpetas(elementos, max_archivos=10, max_bytes=100)
+
+    # 200 alone (over the budget), 60+40, 50+30+10
+    assert asignacion == [2, 1, 1, 2, 2, 0]
+
+
+def test_packing_respects_every_limit():
+    elementos = [(1, 5)] * 7 + [(9, 1)] * 3
+    asignacion = aplanar_directorio.empaquetar_carpetas(elementos, max_archivos=3, max_bytes=10, max_palabras=10)
+
+    for carpeta in set(asignacion):
+        dentro = [elementos[indice] for indice, numero in enumerate(asignacion) if numero == carpeta]
+        assert len(dentro) <= 3
+        assert sum(tamaño for tamaño, _ in dentro) <= 10
+        assert sum(palabras for _, palabras in dentro) <= 10
+
+
+def test_packing_cant_be_combined_with_the_incremental_mode(tmp_path, crear_arbol):
+    origen = crear_arbol(tmp_path / "origen", {"a.txt": "a\n"})
+    with pytest.raises(ValueError):
+        aplanar_directorio.aplanar_directorio(origen, str(tmp_path / "destino"), empaquetar=True, incremental=True)
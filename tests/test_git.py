@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+import aplanar_directorio
+
+pytestmark = pytest.mark.skipif(not aplanar_directorio.verificar_git_disponible(), reason="git no disponible")
+
+ARCHIVOS = {"pequeño.txt": "pocas palabras\n", "docs/grande.txt": "palabra " * 4000}
+
+
+def test_stream_of_a_missing_ref_logs_the_git_error(tmp_path, caplog, repositorio, leer_arbol):
+    _, trabajo, _ = repositorio("uno", ARCHIVOS)
+    destino = str(tmp_path / "destino")
+    resumen = aplanar_directorio.aplanar_directorio(trabajo, destino, git_ref='no-existe')
+
+    assert resumen['archivos_copiados'] == 0
+    assert "Error al listar no-existe" in caplog.text
+    assert leer_arbol(destino) == {}
+
+
+@pytest.mark.parametrize('bare', [False, True])
+def test_partial_clone_leaves_out_the_large_blobs(tmp_path, monkeypatch, repositorio, leer_arbol, bare):
+    # 10 KB: grande.txt (32 KB) is not downloaded
+    monkeypatch.setattr(aplanar_directorio, 'MAX_FILE_SIZE_MB', 10 / 1024)
+    url, _, _ = repositorio("uno", ARCHIVOS)
+    clon = str(tmp_path / "clon")
+    assert aplanar_directorio.clonar_repositorio_git(url, clon, bare=bare)
+
+    destino = str(tmp_path / "destino")
+    if bare:
+        aplanar_directorio.aplanar_directorio(clon, destino, git_ref='HEAD')
+    else:
+        assert not os.path.exists(os.path.join(clon, "docs", "grande.txt"))
+        aplanar_directorio.aplanar_directorio(clon, destino)
+    assert leer_arbol(destino) == {"pequeño.txt": b"pocas palabras\n"}
+
+
+VARIADO = {
+    "modulo/util.py": "def f():\n    return 1\n",
+    "otro/util.py": "def g():\n    return 2\n",
+    "scripts/run.sh": "#!/bin/bash\necho hola\n",
+    "img/logo.png": b'\x89PNG\r\n\x1a\n' + b'\x01' * 100,
+    "datos/blob.bin": b'\x00\x01\x02' * 100,
+    "fuentes/letra.ttf": b'fuente',
+    "vacio.txt": "",
+}
+
+
+def test_stream_matches_the_checkout(tmp_path, repositorio, leer_arbol):
+    _, trabajo, _ = repositorio("uno", VARIADO)
+    del_checkout = str(tmp_path / "checkout")
+    aplanar_directorio.aplanar_directorio(trabajo, del_checkout)
+    del_stream = str(tmp_path / "stream")
+    resumen = aplanar_directorio.aplanar_directorio(trabajo, del_stream, git_ref='HEAD')
+
+    assert resumen['archivos_copiados'] == 5
+    # The walk of the checkout and git list the files in different orders,
+    # so repeated names may get their suffixes the other way round
+    stream, checkout = leer_arbol(del_stream), leer_arbol(del_checkout)
+    assert sorted(stream) == sorted(checkout)
+    assert sorted(stream.values()) == sorted(checkout.values())
+
+
+def test_stream_reads_the_ref_not_the_working_tree(tmp_path, repositorio, commit_git, leer_arbol):
+    _, trabajo, primero = repositorio("uno", {"leeme.txt": "antes\n"})
+    commit_git(trabajo, {"leeme.txt": "despues\n"})
+    with open(os.path.join(trabajo, "leeme.txt"), 'w') as archivo:
+        archivo.write("sin commit\n")
+
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(trabajo, destino, git_ref=primero)
+    assert leer_arbol(destino) == {"leeme.txt": b"antes\n"}
+
+
+def test_sparse_patterns_leave_out_excluded_and_ignored_paths():
+    patrones = aplanar_directorio.patrones_sparse_checkout(["docs/grande [1].txt"], {'node_modules'})
+
+    assert patrones[0] == '/*'
+    assert '!*.[tT][tT][fF]' in patrones
+    assert '!node_modules/' in patrones
+    assert patrones[-1] == '!/docs/grande\\ \\[1].txt'
+
+
+def test_clone_checkout_leaves_out_excluded_and_ignored_paths(tmp_path, repositorio):
+    url, _, _ = repositorio("uno", dict(VARIADO, **{"node_modules/dep/index.js": "x\n", "LETRA.TTF": b'f'}))
+    clon = str(tmp_path / "clon")
+    assert aplanar_directorio.clonar_repositorio_git(url, clon, directorios_ignorados={'node_modules'})
+
+    assert os.path.exists(os.path.join(clon, "modulo", "util.py"))
+    assert not os.path.exists(os.path.join(clon, "fuentes", "letra.ttf"))
+    assert not os.path.exists(os.path.join(clon, "LETRA.TTF"))
+    assert not os.path.exists(os.path.join(clon, "node_modules"))
@@ -0,0 +1,103 @@
+import os
+
+import pytest
+
+import aplanar_directorio
+
+
+def test_incremental_skips_rewrites_and_deletes(tmp_path, crear_arbol, leer_arbol):
+    origen = crear_arbol(tmp_path / "origen", {
+        "a/uno.txt": "uno = 1\n",
+        "b/dos.txt": "dos = 2\n",
+        "c/tres.md": "# tres\n",
+    })
+    destino = str(tmp_path / "destino")
+    primera = aplanar_directorio.aplanar_directorio(origen, destino, incremental=True)
+    assert primera['archivos_copiados'] == 3
+
+    # Nothing changed: every file is skipped without being read
+    segunda = aplanar_directorio.aplanar_directorio(origen, destino, incremental=True)
+    assert (segunda['sin_cambios'], segunda['actualizados'], segunda['eliminados']) == (3, 0, 0)
+
+    # One file changed and one deleted
+    with open(os.path.join(origen, "a", "uno.txt"), 'w') as archivo:
+        archivo.write("uno = 'otro contenido'\n")
+    os.remove(os.path.join(origen, "c", "tres.md"))
+    tercera = aplanar_directorio.aplanar_directorio(origen, destino, incremental=True)
+    assert (tercera['sin_cambios'], tercera['actualizados'], tercera['eliminados']) == (1, 1, 1)
+
+    assert leer_arbol(destino) == {
+        "uno.txt": b"uno = 'otro contenido'\n",
+        "dos.txt": b"dos = 2\n",
+    }
+
+
+def test_incremental_matches_a_fresh_run(tmp_path, arbol_variado, leer_arbol):
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(arbol_variado, destino, incremental=True)
+    aplanar_directorio.aplanar_directorio(arbol_variado, destino, incremental=True)
+
+    nuevo = str(tmp_path / "nuevo")
+    aplanar_directorio.aplanar_directorio(arbol_variado, nuevo)
+    assert leer_arbol(destino) == leer_arbol(nuevo)
+
+
+def test_manifest_round_trip(tmp_path, crear_arbol):
+    origen = crear_arbol(tmp_path / "origen", {"x.txt": "x = 1\n", "dir/vacio.md": ""})
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(origen, destino, incremental=True)
+
+    manifiesto = aplanar_directorio.cargar_manifiesto(destino)
+    assert manifiesto['version'] == aplanar_directorio.VERSION_MANIFIESTO
+    assert set(manifiesto['archivos']) == {"x.txt", "dir/vacio.md"}
+    assert manifiesto['archivos']['x.txt']['destino'] == "x.txt"
+
+    otro = str(tmp_path / "otro")
+    os.makedirs(otro)
+    aplanar_directorio.guardar_manifiesto(otro, manifiesto)
+    assert aplanar_directorio.cargar_manifiesto(otro) == manifiesto
+
+
+def test_manifest_of_another_version_is_ignored(tmp_path):
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.guardar_manifiesto(destino, {'version': -1, 'archivos': {}})
+    assert aplanar_directorio.cargar_manifiesto(destino) is None
+
+
+def test_manifest_is_kept_out_of_the_output(tmp_path, crear_arbol, leer_arbol):
+    origen = crear_arbol(tmp_path / "origen", {"x.txt": "x = 1\n"})
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(origen, destino, incremental=True)
+
+    assert leer_arbol(destino) == {"x.txt": b"x = 1\n"}
+    assert os.path.isfile(str(tmp_path / ("destino" + aplanar_directorio.ARCHIVO_MANIFIESTO)))
+
+
+def test_manifest_inside_the_destination_is_moved_out(tmp_path, crear_arbol, leer_arbol):
+    origen = crear_arbol(tmp_path / "origen", {"x.txt": "x = 1\n", "y.txt": "y = 2\n"})
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(origen, destino, incremental=True)
+    # Where older versions kept it
+    os.replace(aplanar_directorio.ubicacion_manifiesto(destino),
+               os.path.join(destino, aplanar_directorio.ARCHIVO_MANIFIESTO))
+
+    resumen = aplanar_directorio.aplanar_directorio(origen, destino, incremental=True)
+    assert resumen['sin_cambios'] == 2
+    assert leer_arbol(destino) == {"x.txt": b"x = 1\n", "y.txt": b"y = 2\n"}
+    assert os.path.isfile(aplanar_directorio.ubicacion_manifiesto(destino))
+
+
+@pytest.mark.parametrize('clase', [aplanar_directorio.VigilanteInotify, aplanar_directorio.VigilanteSondeo])
+def test_watchers_ignore_the_manifest_inside_the_source(tmp_path, crear_arbol, clase):
+    origen = crear_arbol(tmp_path / "origen", {"x.txt": "x = 1\n"})
+    destino = os.path.join(origen, "salida")
+    vigilante = clase(origen, excluido=destino)
+    try:
+        aplanar_directorio.guardar_manifiesto(destino, {'version': aplanar_directorio.VERSION_MANIFIESTO})
+        if clase is aplanar_directorio.VigilanteSondeo:
+            assert set(vigilante._recorrer()) == {"x.txt"}
+        else:
+            assert vigilante._leer(1)
+            assert not vigilante.tocados
+    finally:
+        vigilante.cerrar()
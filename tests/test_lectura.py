@@ -0,0 +1,44 @@
+import collections
+
+import aplanar_directorio
+
+
+def test_each_source_file_is_opened_once(tmp_path, monkeypatch, arbol_variado):
+    aperturas = collections.Counter()
+    abrir = aplanar_directorio.abrir_archivo_origen
+
+    def contar(ruta, estado):
+        aperturas[ruta] += 1
+        return abrir(ruta, estado)
+
+    monkeypatch.setattr(aplanar_directorio, 'abrir_archivo_origen', contar)
+    aplanar_directorio.aplanar_directorio(arbol_variado, str(tmp_path / "destino"))
+
+    assert aperturas
+    assert set(aperturas.values()) == {1}
+
+
+def test_streamed_files_match_the_in_memory_output(tmp_path, monkeypatch, arbol_variado, leer_arbol):
+    en_memoria = str(tmp_path / "en_memoria")
+    aplanar_directorio.aplanar_directorio(arbol_variado, en_memoria)
+
+    # Every file goes through the temporary file, in small chunks
+    monkeypatch.setattr(aplanar_directorio, 'MAX_BUFFER_MEMORIA_MB', 0)
+    monkeypatch.setattr(aplanar_directorio, 'TAMAÑO_BLOQUE_LECTURA', 5)
+    en_disco = str(tmp_path / "en_disco")
+    aplanar_directorio.aplanar_directorio(arbol_variado, en_disco)
+
+    assert leer_arbol(en_disco) == leer_arbol(en_memoria)
+
+
+def test_shebang_is_cleaned_and_empty_files_are_skipped(tmp_path, crear_arbol, leer_arbol):
+    origen = crear_arbol(tmp_path / "origen", {
+        "scripts/run.sh": "#!/bin/bash\necho hola\n",
+        "vacio.txt": "",
+    })
+    destino = str(tmp_path / "destino")
+    resumen = aplanar_directorio.aplanar_directorio(origen, destino)
+
+    salida = {ruta.rsplit('/', 1)[-1]: contenido for ruta, contenido in leer_arbol(destino).items()}
+    assert salida == {"run.md": b"echo hola\n"}
+    assert resumen['archivos_vacios'] == 1
@@ -0,0 +1,42 @@
+import json
+import sys
+
+import aplanar_directorio
+
+
+class QuitarTodo(aplanar_directorio.TransformacionLineas):
+    evento = "TODO lines removed"
+    mensaje = "  -> TODO lines removed from: %s"
+
+    def linea(self, linea):
+        if b'TODO' in linea:
+            self.cambios += 1
+            return b''
+        return linea
+
+
+def _opciones(monkeypatch, *argumentos):
+    monkeypatch.setattr(sys, 'argv', ['aplanar_directorio.py'] + list(argumentos))
+    return aplanar_directorio.parsear_argumentos()[-1]
+
+
+def test_batch_flattens_every_source_on_spawned_processes(tmp_path, monkeypatch, crear_arbol, leer_arbol):
+    monkeypatch.setitem(aplanar_directorio.TRANSFORMACIONES, 'quitar_todo', QuitarTodo)
+    uno = crear_arbol(tmp_path / "uno", {"a/x.txt": "x\nTODO x\n"})
+    dos = crear_arbol(tmp_path / "dos", {"b/y.md": "# y\n"})
+    ruta_lote = str(tmp_path / "lote.json")
+    with open(ruta_lote, 'w') as archivo:
+        json.dump([
+            {"origen": uno, "destino": str(tmp_path / "destino_uno"),
+             "opciones": {"reglas": {"transformaciones": {".txt": ["quitar_todo"]}}}},
+            {"origen": dos, "destino": str(tmp_path / "destino_dos")},
+        ], archivo)
+
+    opciones = _opciones(monkeypatch, '--batch', ruta_lote, '--max-copias', '1')
+    assert aplanar_directorio.ejecutar_lote(ruta_lote, opciones)
+
+    assert leer_arbol(tmp_path / "destino_uno") == {"x.txt": b"x\n"}
+    assert leer_arbol(tmp_path / "destino_dos") == {"y.md": b"# y\n"}
+    with open(tmp_path / "lote_resultados" / "resumen.json") as archivo:
+        resumen = json.load(archivo)
+    assert (resumen['fuentes'], resumen['fallidas']) == (2, 0)
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+import aplanar_directorio
+
+
+def test_runs_without_metrics_report_nothing(tmp_path, crear_arbol):
+    origen = crear_arbol(tmp_path / "origen", {"a.txt": "a\n"})
+    resumen = aplanar_directorio.aplanar_directorio(origen, str(tmp_path / "destino"))
+    assert resumen['metricas'] is None
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_report_covers_every_stage(tmp_path, arbol_variado, workers):
+    eventos = []
+    resumen = aplanar_directorio.aplanar_directorio(arbol_variado, str(tmp_path / "destino"), workers=workers,
+                                                    hook_metricas=lambda evento, datos: eventos.append((evento, datos)))
+
+    informe = resumen['metricas']
+    json.dumps(informe)
+    assert {'recorrido', 'estado', 'analisis', 'palabras', 'transformaciones', 'nombres', 'copia'} <= set(informe['etapas'])
+    # Every file of the source is counted, including the empty and rejected ones
+    assert informe['archivos'] == informe['etapas']['estado']['llamadas']
+    # Empty files take a name but are not written
+    escritos = resumen['archivos_copiados'] + resumen['imagenes_copiadas'] - resumen['archivos_vacios']
+    assert informe['etapas']['copia']['llamadas'] == escritos
+
+    # The hook gets every measure and, last, the same report
+    assert eventos[-1] == ('informe', informe)
+    medidas = [datos for evento, datos in eventos if evento == 'etapa']
+    assert len(medidas) == sum(etapa['llamadas'] for etapa in informe['etapas'].values())
+
+
+def test_slowest_files_are_kept_per_stage():
+    metricas = aplanar_directorio.MetricasEjecucion(max_lentos=2)
+    for segundos, ruta in [(0.3, "c"), (0.1, "a"), (0.5, "e"), (0.2, "b")]:
+        metricas.registrar('copia', segundos, ruta, 10)
+
+    etapa = metricas.informe()['etapas']['copia']
+    assert (etapa['llamadas'], etapa['bytes']) == (4, 40)
+    assert [lento['ruta'] for lento in etapa['mas_lentos']] == ["e", "c"]
+
+
+def test_disabled_metrics_measure_nothing():
+    metricas = aplanar_directorio.MetricasEjecucion(activa=False)
+    with metricas.etapa('copia', "a", 10):
+        pass
+    assert list(metricas.iterar('recorrido', [1, 2])) == [1, 2]
+    assert metricas.etapas == {}
+
+
+def test_hook_is_loaded_from_module_and_function():
+    assert aplanar_directorio.cargar_hook_metricas('json:dumps') is json.dumps
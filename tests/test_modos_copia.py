@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+import aplanar_directorio
+
+
+@pytest.mark.parametrize('modo', [modo for modo in aplanar_directorio.MODOS_COPIA if modo != 'copy2'])
+def test_copy_modes_match_a_plain_copy(tmp_path, arbol_variado, leer_arbol, modo):
+    copia = str(tmp_path / "copy2")
+    aplanar_directorio.aplanar_directorio(arbol_variado, copia)
+    destino = str(tmp_path / modo)
+    resumen = aplanar_directorio.aplanar_directorio(arbol_variado, destino, modo_copia=modo)
+
+    assert leer_arbol(destino) == leer_arbol(copia)
+    assert resumen['archivos_copiados'] > 0
+
+
+@pytest.mark.parametrize('modo', ['copy2', 'reflink', 'copy_file_range'])
+def test_copy_modes_keep_permissions_and_times(tmp_path, crear_arbol, modo):
+    origen = crear_arbol(tmp_path / "origen", {"bin/herramienta.txt": "hola\n"})
+    ruta_origen = os.path.join(origen, "bin", "herramienta.txt")
+    os.chmod(ruta_origen, 0o750)
+    os.utime(ruta_origen, ns=(1_000_000_000, 2_000_000_000))
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(origen, destino, modo_copia=modo)
+
+    estado = os.stat(os.path.join(destino, "herramienta.txt"))
+    assert (estado.st_mode & 0o777, estado.st_mtime_ns) == (0o750, 2_000_000_000)
+
+
+def test_hardlink_mode_links_the_source(tmp_path, crear_arbol):
+    origen = crear_arbol(tmp_path / "origen", {"a/datos.txt": "hola\n"})
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(origen, destino, modo_copia='hardlink')
+
+    assert (os.stat(os.path.join(destino, "datos.txt")).st_ino
+            == os.stat(os.path.join(origen, "a", "datos.txt")).st_ino)
@@ -0,0 +1,51 @@
+import os
+import threading
+
+import aplanar_directorio
+
+
+def test_conflicts_get_the_first_free_suffix(tmp_path):
+    directorio = str(tmp_path)
+    (tmp_path / "x.txt").write_text("ya estaba")
+    (tmp_path / "x_2.txt").write_text("ya estaba")
+    asignador = aplanar_directorio.AsignadorNombres()
+
+    nombres = [os.path.basename(asignador.asignar(directorio, "x.txt")) for _ in range(4)]
+    assert nombres == ["x_1.txt", "x_3.txt", "x_4.txt", "x_5.txt"]
+    assert os.path.basename(asignador.asignar(directorio, "y.txt")) == "y.txt"
+
+
+def test_reserved_names_are_not_handed_out(tmp_path):
+    directorio = str(tmp_path)
+    asignador = aplanar_directorio.AsignadorNombres()
+    asignador.reservar(os.path.join(directorio, "x.txt"))
+    asignador.reservar(os.path.join(directorio, "x_1.txt"))
+    assert asignador.asignar(directorio, "x.txt") == os.path.join(directorio, "x_2.txt")
+
+
+def test_threads_never_get_the_same_name(tmp_path):
+    directorio = str(tmp_path)
+    asignador = aplanar_directorio.AsignadorNombres()
+    rutas = []
+
+    def asignar():
+        for _ in range(200):
+            rutas.append(asignador.asignar(directorio, "x.txt"))
+
+    hilos = [threading.Thread(target=asignar) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(set(rutas)) == len(rutas) == 800
+
+
+def test_repeated_names_keep_every_file(tmp_path, crear_arbol, leer_arbol):
+    origen = crear_arbol(tmp_path / "origen", {f"d{indice}/leeme.txt": f"{indice}\n" for indice in range(5)})
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(origen, destino)
+
+    salida = leer_arbol(destino)
+    assert sorted(ruta.rsplit('/', 1)[-1] for ruta in salida) == [
+        "leeme.txt", "leeme_1.txt", "leeme_2.txt", "leeme_3.txt", "leeme_4.txt"]
+    assert sorted(salida.values()) == [f"{indice}\n".encode() for indice in range(5)]
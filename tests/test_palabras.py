@@ -0,0 +1,36 @@
+import pytest
+
+import aplanar_directorio
+
+TEXTO = "uno dos\ttres\n\ncuatro  cinco\x0bseis\x0csiete\r\nocho\x1cnueve   diez\n" * 50
+
+
+@pytest.mark.parametrize('bloque', [1, 3, 7, 64, 1024 * 1024])
+def test_words_split_across_chunks_are_counted_once(tmp_path, monkeypatch, bloque):
+    monkeypatch.setattr(aplanar_directorio, 'TAMAÑO_BLOQUE_LECTURA', bloque)
+    ruta = tmp_path / "texto.txt"
+    ruta.write_text(TEXTO)
+    assert aplanar_directorio.contar_palabras_archivo(str(ruta)) == len(TEXTO.split()) == 500
+
+
+def test_count_stops_early_over_the_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(aplanar_directorio, 'TAMAÑO_BLOQUE_LECTURA', 64)
+    ruta = tmp_path / "texto.txt"
+    ruta.write_text("palabra " * 10000)
+    palabras = aplanar_directorio.contar_palabras_archivo(str(ruta), limite=20)
+    # Only the chunk that crossed the limit was counted
+    assert 20 < palabras <= 20 + 64 // len("palabra ") + 1
+
+
+def test_binary_words_are_estimated_from_the_size(tmp_path):
+    ruta = tmp_path / "datos.bin"
+    ruta.write_bytes(b"\x00\x01 palabra " * 1000)
+    assert aplanar_directorio.contar_palabras_archivo(str(ruta)) == aplanar_directorio.estimar_palabras_binario(11000)
+
+
+def test_file_over_the_word_limit_is_rejected(tmp_path, monkeypatch, crear_arbol, leer_arbol):
+    monkeypatch.setattr(aplanar_directorio, 'MAX_WORDS_PER_FILE', 5)
+    origen = crear_arbol(tmp_path / "origen", {"corto.txt": "una dos tres\n", "largo.txt": "a b c d e f\n"})
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(origen, destino)
+    assert leer_arbol(destino) == {"corto.txt": b"una dos tres\n"}
@@ -0,0 +1,40 @@
+import pytest
+
+import aplanar_directorio
+
+
+def _archivos_por_carpeta(salida):
+    carpetas = {}
+    for ruta in salida:
+        carpeta = ruta.rsplit('/', 1)[0] if '/' in ruta else '.'
+        carpetas[carpeta] = carpetas.get(carpeta, 0) + 1
+    return carpetas
+
+
+@pytest.mark.parametrize('empaquetar', [False, True])
+def test_plan_of_a_small_tree_matches_the_run(tmp_path, monkeypatch, arbol_variado, leer_arbol, empaquetar):
+    monkeypatch.setattr(aplanar_directorio, 'MAX_FILES_PER_FOLDER', 40)
+    # grande.log is over the word limit
+    monkeypatch.setattr(aplanar_directorio, 'MAX_WORDS_PER_FILE', 100000)
+    antes = leer_arbol(arbol_variado)
+    plan = aplanar_directorio.planificar_aplanado(arbol_variado, empaquetar=empaquetar, max_mb_carpeta=0.002)
+    # Nothing was written
+    assert leer_arbol(arbol_variado) == antes
+
+    destino = str(tmp_path / "destino")
+    resumen = aplanar_directorio.aplanar_directorio(arbol_variado, destino, empaquetar=empaquetar, max_mb_carpeta=0.002)
+
+    # Every file is in the sample, so the plan is exact
+    claves = ('archivos_copiados', 'imagenes_copiadas', 'archivos_vacios', 'carpetas_archivos', 'carpetas_imagenes')
+    assert {clave: plan[clave] for clave in claves} == {clave: resumen[clave] for clave in claves}
+    assert plan['descartados']['demasiadas_palabras'] == 1
+    assert plan['descartados']['demasiadas_palabras_intervalo_95'] == [1, 1]
+    assert plan['descartados']['excluidos'] == 1
+    # Empty folders (imagenes_1 when there are no images) are not in the
+    # output, and the empty file takes a slot but is not written
+    previstas = {carpeta['carpeta']: carpeta['archivos'] for carpeta in plan['carpetas'] if carpeta['archivos']}
+    reales = _archivos_por_carpeta(leer_arbol(destino))
+    assert len(reales) > 2
+    assert set(previstas) == set(reales)
+    diferencias = [previstas[carpeta] - reales[carpeta] for carpeta in reales]
+    assert set(diferencias) <= {0, 1} and sum(diferencias) == resumen['archivos_vacios']
@@ -0,0 +1,71 @@
+import pytest
+
+import aplanar_directorio
+
+
+def test_procesos_same_output_as_serial(tmp_path, arbol_variado, leer_arbol):
+    serie = tmp_path / "serie"
+    procesos = tmp_path / "procesos"
+    aplanar_directorio.aplanar_directorio(arbol_variado, str(serie))
+    # Threshold 0: every text file is analyzed on the process pool
+    aplanar_directorio.aplanar_directorio(arbol_variado, str(procesos), workers=2, procesos=2,
+                                          umbral_proceso_mb=0)
+
+    assert leer_arbol(serie) == leer_arbol(procesos)
+
+
+class QuitarTodo(aplanar_directorio.TransformacionLineas):
+    evento = "TODO lines removed"
+    mensaje = "  -> TODO lines removed from: %s"
+
+    def linea(self, linea):
+        if b'TODO' in linea:
+            self.cambios += 1
+            return b''
+        return linea
+
+
+def test_registered_transformation_reaches_the_processes(tmp_path, monkeypatch, caplog, crear_arbol, leer_arbol):
+    monkeypatch.setitem(aplanar_directorio.TRANSFORMACIONES, 'quitar_todo', QuitarTodo)
+    origen = crear_arbol(tmp_path / "origen", {"notas.txt": "uno\nTODO dos\ntres\n"})
+    destino = tmp_path / "destino"
+    reglas = aplanar_directorio.combinar_reglas(aplanar_directorio.REGLAS_POR_DEFECTO,
+                                                {'transformaciones': {'.txt': ['quitar_todo']}})
+    with aplanar_directorio.aplicar_reglas(reglas):
+        aplanar_directorio.aplanar_directorio(origen, str(destino), workers=2, procesos=2, umbral_proceso_mb=0)
+
+    assert leer_arbol(destino) == {"notas.txt": b"uno\ntres\n"}
+    # Not analyzed again here after failing in the process
+    assert "otro proceso" not in caplog.text
+
+
+def test_registered_transformation_not_importable_is_rejected(tmp_path, monkeypatch, crear_arbol):
+    class Local(QuitarTodo):
+        pass
+
+    monkeypatch.setitem(aplanar_directorio.TRANSFORMACIONES, 'local', Local)
+    origen = crear_arbol(tmp_path / "origen", {"notas.txt": "uno\n"})
+    with pytest.raises(ValueError, match="local"):
+        aplanar_directorio.aplanar_directorio(origen, str(tmp_path / "destino"), procesos=1)
+
+
+class AvisarTodo(aplanar_directorio.TransformacionLineas):
+    evento = "TODO lines found"
+    mensaje = "  -> TODO lines found in: %s"
+
+    def linea(self, linea):
+        if b'TODO' in linea:
+            aplanar_directorio.registro.warning("  !! TODO pendiente")
+        return linea
+
+
+def test_log_of_the_processes_goes_to_the_parent(tmp_path, monkeypatch, caplog, crear_arbol):
+    monkeypatch.setitem(aplanar_directorio.TRANSFORMACIONES, 'avisar_todo', AvisarTodo)
+    origen = crear_arbol(tmp_path / "origen", {"notas.txt": "uno\nTODO dos\n"})
+    reglas = aplanar_directorio.combinar_reglas(aplanar_directorio.REGLAS_POR_DEFECTO,
+                                                {'transformaciones': {'.txt': ['avisar_todo']}})
+    with aplanar_directorio.aplicar_reglas(reglas):
+        aplanar_directorio.aplanar_directorio(origen, str(tmp_path / "destino"), procesos=1, umbral_proceso_mb=0)
+
+    assert "TODO pendiente" in caplog.text
+    assert "otro proceso" not in caplog.text
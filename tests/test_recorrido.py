@@ -0,0 +1,27 @@
+import aplanar_directorio
+
+ARCHIVOS = {
+    "leeme.md": "# raíz\n",
+    ".git/config": "[core]\n",
+    "sub/.git": "gitdir: ../.git/modules/sub\n",
+    "sub/codigo.txt": "código\n",
+    "node_modules/paquete/indice.txt": "dependencia\n",
+}
+
+
+def test_walk_skips_git_directories_and_gitlink_files(tmp_path, crear_arbol):
+    origen = crear_arbol(tmp_path / "origen", ARCHIVOS)
+    rutas = [ruta for ruta, _ in aplanar_directorio.recorrer_origen(origen)]
+    assert sorted(rutas) == ["leeme.md", "node_modules/paquete/indice.txt", "sub/codigo.txt"]
+
+
+def test_gitlink_files_are_kept_when_git_is_not_ignored(tmp_path, crear_arbol):
+    origen = crear_arbol(tmp_path / "origen", ARCHIVOS)
+    rutas = [ruta for ruta, _ in aplanar_directorio.recorrer_origen(origen, {'node_modules'})]
+    assert sorted(rutas) == [".git/config", "leeme.md", "sub/.git", "sub/codigo.txt"]
+
+
+def test_walk_and_polling_watcher_see_the_same_files(tmp_path, crear_arbol):
+    origen = crear_arbol(tmp_path / "origen", ARCHIVOS)
+    vigilante = aplanar_directorio.VigilanteSondeo(origen)
+    assert sorted(vigilante.estados) == sorted(ruta for ruta, _ in aplanar_directorio.recorrer_origen(origen))
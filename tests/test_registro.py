@@ -0,0 +1,42 @@
+import io
+import time
+
+import pytest
+
+import aplanar_directorio
+
+
+class SalidaVigilada(io.StringIO):
+    """
+    stdout that keeps what had been flushed.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.vaciado = ''
+
+    def flush(self):
+        super().flush()
+        self.vaciado = self.getvalue()
+
+
+@pytest.fixture
+def registro_restaurado():
+    registro = aplanar_directorio.registro
+    anterior = (registro.handlers[:], registro.level, registro.propagate)
+    yield registro
+    aplanar_directorio.detener_registro()
+    registro.handlers[:], registro.level, registro.propagate = anterior
+
+
+def test_idle_log_is_flushed(monkeypatch, registro_restaurado):
+    salida = SalidaVigilada()
+    monkeypatch.setattr('sys.stdout', salida)
+    monkeypatch.setattr(aplanar_directorio, 'INTERVALO_VACIADO_REGISTRO_S', 0.05)
+    aplanar_directorio.configurar_registro()
+    registro_restaurado.info("esperando cambios")
+
+    limite = time.monotonic() + 5
+    while "esperando cambios" not in salida.vaciado and time.monotonic() < limite:
+        time.sleep(0.01)
+    assert "esperando cambios" in salida.vaciado
@@ -0,0 +1,36 @@
+import pytest
+
+import aplanar_directorio
+
+
+def _reglas(cambios):
+    return aplanar_directorio.combinar_reglas(aplanar_directorio.REGLAS_POR_DEFECTO, cambios)
+
+
+@pytest.mark.parametrize('cambios, mensaje', [
+    ({'transformaciones': {'.py': 'licencia'}}, "deben ser una lista"),
+    ({'transformaciones': {'.py': ['no_existe']}}, "desconocida"),
+    ({'limites': {'max_words_per_file': '1000'}}, "debe ser un número"),
+    ({'limites': {'max_file_size_mb': None}}, "debe ser un número"),
+    ({'limites': {'max_files_per_folder': True}}, "debe ser un número"),
+])
+def test_invalid_rules_are_rejected(cambios, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        aplanar_directorio.compilar_reglas(_reglas(cambios))
+
+
+def test_invalid_limits_leave_the_settings_unchanged():
+    anterior = aplanar_directorio.MAX_WORDS_PER_FILE
+    with pytest.raises(ValueError):
+        with aplanar_directorio.aplicar_reglas(_reglas({'limites': {'max_words_per_file': '1000'}})):
+            pass
+    assert aplanar_directorio.MAX_WORDS_PER_FILE == anterior
+
+
+def test_rules_set_the_limits_inside_the_block():
+    anterior = aplanar_directorio.MAX_WORDS_PER_FILE
+    with aplanar_directorio.aplicar_reglas(_reglas({'limites': {'max_words_per_file': 1000},
+                                                    'transformaciones': {'.txt': ['licencia']}})) as compiladas:
+        assert aplanar_directorio.MAX_WORDS_PER_FILE == 1000
+        assert compiladas['rutas']['.txt']['transformaciones'] == ('licencia',)
+    assert aplanar_directorio.MAX_WORDS_PER_FILE == anterior
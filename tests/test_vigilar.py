@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+import aplanar_directorio
+
+ARCHIVOS = {
+    "a/uno.txt": "uno = 1\n",
+    "b/dos.txt": "dos = 2\n",
+    "c/tres.txt": "tres = 3\n",
+    "d/cuatro.txt": "cuatro = 4\n",
+}
+
+
+@pytest.fixture(params=['inotify', 'sondeo'])
+def crear_vigilante(request, monkeypatch):
+    monkeypatch.setattr(aplanar_directorio, 'INTERVALO_SONDEO_S', 0.05)
+    clase = aplanar_directorio.VigilanteInotify if request.param == 'inotify' else aplanar_directorio.VigilanteSondeo
+    vigilantes = []
+
+    def crear(origen, **argumentos):
+        try:
+            vigilante = clase(origen, **argumentos)
+        except OSError as e:
+            pytest.skip(f"inotify no disponible: {e}")
+        vigilantes.append(vigilante)
+        return vigilante
+
+    yield crear
+    for vigilante in vigilantes:
+        vigilante.cerrar()
+
+
+def test_changes_are_seen_and_applied(tmp_path, crear_arbol, leer_arbol, crear_vigilante):
+    origen = crear_arbol(tmp_path / "origen", ARCHIVOS)
+    destino = str(tmp_path / "destino")
+    aplanar_directorio.aplanar_directorio(origen, destino, incremental=True)
+    vigilante = crear_vigilante(origen)
+
+    crear_arbol(origen, {"a/uno.txt": "uno = 'otro contenido'\n", "e/nuevo/cinco.txt": "cinco = 5\n"})
+    os.rename(os.path.join(origen, "b", "dos.txt"), os.path.join(origen, "b", "dos_movido.txt"))
+    os.remove(os.path.join(origen, "c", "tres.txt"))
+    cambios = vigilante.esperar_cambios()
+
+    assert sorted(cambios['rutas']) == ["a/uno.txt", "b/dos_movido.txt", "e/nuevo/cinco.txt"]
+    assert cambios['renombrados'] == {"b/dos_movido.txt": "b/dos.txt"}
+    assert cambios['eliminados'] == ["c/tres.txt"]
+
+    resumen = aplanar_directorio.aplanar_directorio(origen, destino, cambios=cambios)
+    assert (resumen['actualizados'], resumen['renombrados'], resumen['eliminados']) == (1, 1, 1)
+    assert leer_arbol(destino) == {
+        "uno.txt": b"uno = 'otro contenido'\n",
+        "dos_movido.txt": b"dos = 2\n",
+        "cuatro.txt": b"cuatro = 4\n",
+        "cinco.txt": b"cinco = 5\n",
+    }
+
+
+def test_ignored_directories_and_the_destination_are_not_watched(tmp_path, crear_arbol, crear_vigilante):
+    origen = crear_arbol(tmp_path / "origen", ARCHIVOS)
+    destino = os.path.join(origen, "salida")
+    vigilante = crear_vigilante(origen, directorios_ignorados={'.git', 'node_modules'},
+                                excluido=os.path.abspath(destino))
+
+    crear_arbol(origen, {"node_modules/dep/index.js": "x\n", "salida/uno.txt": "uno\n", ".git/HEAD": "ref\n"})
+    crear_arbol(origen, {"d/cuatro.txt": "cuatro = 'cambiado'\n"})
+    cambios = vigilante.esperar_cambios()
+
+    assert cambios == {'rutas': ["d/cuatro.txt"], 'renombrados': {}, 'eliminados': []}
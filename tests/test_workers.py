@@ -0,0 +1,10 @@
+import aplanar_directorio
+
+
+def test_workers_same_output_as_serial(tmp_path, arbol_variado, leer_arbol):
+    serie = tmp_path / "serie"
+    paralelo = tmp_path / "paralelo"
+    aplanar_directorio.aplanar_directorio(arbol_variado, str(serie))
+    aplanar_directorio.aplanar_directorio(arbol_variado, str(paralelo), workers=8)
+
+    assert leer_arbol(serie) == leer_arbol(paralelo)